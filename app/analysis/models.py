@@ -56,7 +56,9 @@ class Occurence(db.Model):
     __tablename__ = "Occurence"
 
     id = Column(Integer, primary_key=True)
-    vulnerability_id = db.Column(db.Integer, db.ForeignKey("Vulnerability.id"), nullable=False)
+    vulnerability_id = db.Column(
+        db.Integer, db.ForeignKey("Vulnerability.id"), nullable=False, index=True
+    )
     vulnerability = db.relationship(
         "Vulnerability",
         backref=db.backref("occurences", lazy=True, cascade="all, delete-orphan"),
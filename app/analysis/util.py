@@ -57,6 +57,11 @@ from app.projects.util import (
 )
 from app.rules.util import generate_severity
 
+# Prefix of the project's extracted sources in semgrep results' paths
+SRC_PATH_PREFIX_RE = re.compile(
+    PROJECTS_SRC_PATH + "[\\/]?\\d+[\\/]" + EXTRACT_FOLDER_NAME + "[\\/]?"
+)
+
 ##
 ## Analysis utils
 ##
@@ -297,8 +302,7 @@ def load_occurence(sast_result):
     Returns:
         Occurence: fully populated occurence
     """
-    pattern = PROJECTS_SRC_PATH + "[\\/]?\d+[\\/]" + EXTRACT_FOLDER_NAME + "[\\/]?"
-    clean_path = re.sub(pattern, "", sast_result["path"])
+    clean_path = SRC_PATH_PREFIX_RE.sub("", sast_result["path"])
     occurence = Occurence(
         file_path=clean_path, match_string=sast_result["extra"]["lines"]
     )
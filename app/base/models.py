@@ -5,7 +5,7 @@ Copyright (c) 2021 - present Orange Cyberdefense
 """
 
 from flask_login import UserMixin
-from sqlalchemy import Boolean, Column, Integer, LargeBinary, String, Table, ForeignKey
+from sqlalchemy import Boolean, Column, Index, Integer, LargeBinary, String, Table, ForeignKey
 from sqlalchemy.orm import relationship
 
 from app import db, login_manager
@@ -16,13 +16,15 @@ from app.projects.models import Project
 team_members_association = Table(
     'team_members', db.metadata,
     Column('team_id', Integer, ForeignKey('Team.id', name='fk_team_members_team_id')),
-    Column('user_id', Integer, ForeignKey('User.id', name='fk_team_members_user_id'))
+    Column('user_id', Integer, ForeignKey('User.id', name='fk_team_members_user_id')),
+    Index('ix_team_members_user_id_team_id', 'user_id', 'team_id')
 )
 
 team_projet_association = Table(
     'team_projets', db.metadata,
     Column('team_id', Integer, ForeignKey('Team.id', name='fk_team_projets_team_id')),
-    Column('project_id', Integer, ForeignKey('Project.id', name='fk_team_projets_project_id'))
+    Column('project_id', Integer, ForeignKey('Project.id', name='fk_team_projets_project_id')),
+    Index('ix_team_projets_team_id_project_id', 'team_id', 'project_id')
 )
 
 class User(db.Model, UserMixin):
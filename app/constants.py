@@ -54,6 +54,7 @@ RULES_PATH = "data/rules/"
 LOCAL_RULES ="local_rules"
 LOCAL_RULES_PATH ="data/rules/" + LOCAL_RULES + "/"
 RULE_EXTENSIONS = {".yaml", ".yml"}
+GIT = "git"
 OWASP_TOP10_LINKS = {
     "A01": "https://owasp.org/Top10/A01_2021-Broken_Access_Control/",
     "A02": "https://owasp.org/Top10/A02_2021-Cryptographic_Failures/",
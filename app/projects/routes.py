@@ -19,6 +19,7 @@ from flask import (
     request,
 )
 from flask_login import current_user, login_required
+from sqlalchemy.orm import selectinload
 from werkzeug.utils import secure_filename
 
 from app import db
@@ -30,7 +31,7 @@ from app.constants import (
 from app.base import util
 from app.projects import blueprint
 from app.projects.forms import ProjectForm, XLSExportForm
-from app.projects.models import Project
+from app.projects.models import Project, ProjectLinesCount
 from app.projects.util import (
     check_zipfile,
     count_lines,
@@ -42,12 +43,21 @@ from app.projects.util import (
     get_user_projects_ids,
 )
 from app.base.models import Team
+from app.rules.util import get_supported_languages_by_name
 
 
 @blueprint.route("/projects")
 @login_required
 def projects_list():
-    projects = Project.query.all()
+    # Eager load relationships displayed for every project in the list
+    projects = Project.query.options(
+        selectinload(Project.analysis),
+        selectinload(Project.appinspector),
+        selectinload(Project.creator),
+        selectinload(Project.project_lines_count).selectinload(
+            ProjectLinesCount.language_lines_counts
+        ),
+    ).all()
     project_form = ProjectForm()
     admin = util.is_admin(current_user.role)
     user_projects_ids = get_user_projects_ids(current_user)
@@ -59,6 +69,7 @@ def projects_list():
         admin=admin,
         user_projects_ids=user_projects_ids,
         top_supported_language_lines_counts=top_supported_language_lines_counts,
+        supported_languages=get_supported_languages_by_name(),
         lang_icons=LANGUAGES_DEVICONS,
         segment="projects",
     )
@@ -152,8 +163,10 @@ def projects_create():
             )
             remove_project(project)
             return msg, 403
-        # Extract archive on disk
+        # Archive digest is persisted and meant to be compared with external
+        # tooling (sha256sum), so a faster non-standard hash can't be used here
         project.archive_sha256sum = sha256sum(archive_path)
+        # Extract archive on disk
         source_path = os.path.join(project_path, EXTRACT_FOLDER_NAME)
         with ZipFile(archive_path, "r") as zip_ref:
             try:
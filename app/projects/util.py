@@ -3,16 +3,20 @@
 Copyright (c) 2021 - present Orange Cyberdefense
 """
 
-import json
+import hashlib
+import heapq
+import mmap
 import os
 import pathlib
 import subprocess
-from hashlib import sha256
+from operator import attrgetter
 from shutil import rmtree
 from zipfile import ZipFile, is_zipfile
 
+import orjson
 from openpyxl import Workbook
 from openpyxl.styles import Alignment, PatternFill
+from sqlalchemy import and_, exists, func
 
 from app import db
 from app.constants import (
@@ -26,9 +30,13 @@ from app.constants import (
     SEVERITY_LOW,
     SEVERITY_MEDIUM,
 )
+from app.analysis.models import Occurence, Vulnerability, VulnerableDependency
 from app.projects.models import LanguageLinesCount, ProjectLinesCount
-from app.rules.models import SupportedLanguage
-from app.base.models import Team
+from app.rules.util import get_supported_languages_by_name
+from app.base.models import (
+    team_members_association,
+    team_projet_association,
+)
 
 ##
 ## Project utils
@@ -57,28 +65,33 @@ def count_lines(project):
         project (project): project with an already extracted source archive
     """
     source_path = os.path.join(PROJECTS_SRC_PATH, str(project.id), EXTRACT_FOLDER_NAME)
-    # Call to external binary: scc
-    json_result = json.loads(
-        subprocess.run([SCC, source_path, "-f", "json"], capture_output=True).stdout
-    )
+    # Call to external binary: scc (only stdout is buffered, it is parsed as is)
+    with subprocess.Popen(
+        [SCC, source_path, "-f", "json"], stdout=subprocess.PIPE
+    ) as scc_process:
+        json_result = orjson.loads(scc_process.stdout.read())
     project.project_lines_count = load_project_lines_count(json_result)
 
 
 def sha256sum(file_path):
     """Calculate the SHA256 sum of a file.
 
+    The file is memory-mapped and hashed in a single hashlib (OpenSSL EVP) call,
+    which releases the GIL and uses the SHA-NI CPU extensions when available
+    (OpenSSL >= 1.1.1).
+
     Args:
         file_path (str): file for which to calculate the sum
 
     Returns:
         str: digest of the SHA256 sum
     """
-    sha256_hash = sha256()
     with open(file_path, "rb") as f:
-        # Read and update hash string value in blocks of 4K
-        for byte_block in iter(lambda: f.read(4096), b""):
-            sha256_hash.update(byte_block)
-        return sha256_hash.hexdigest()
+        # Empty files can't be memory-mapped
+        if os.fstat(f.fileno()).st_size == 0:
+            return hashlib.sha256().hexdigest()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return hashlib.sha256(mm).hexdigest()
 
 
 def check_zipfile(zip_path):
@@ -93,15 +106,17 @@ def check_zipfile(zip_path):
     """
     error = False
     msg = ""
-    if not is_zipfile(zip_path):
-        error = True
-        msg = "invalid zip file"
-    else:
-        for zinfo in ZipFile(zip_path, "r").infolist():
-            if zinfo.flag_bits & 0x1:
-                error = True
-                msg = "encrypted zip file"
-                break
+    # Open the archive once for both checks
+    with open(zip_path, "rb") as zip_file:
+        if not is_zipfile(zip_file):
+            error = True
+            msg = "invalid zip file"
+        else:
+            zip_file.seek(0)
+            with ZipFile(zip_file, "r") as zip_ref:
+                if any(zinfo.flag_bits & 0x1 for zinfo in zip_ref.infolist()):
+                    error = True
+                    msg = "encrypted zip file"
     return error, msg
 
 
@@ -118,9 +133,13 @@ def count_occurences(project):
     occurences_count = 0
     # We need an analysis to count occurences
     if project.analysis is not None:
-        # Count the total number of vulnerability occurences
-        for c_vulnerability in project.analysis.vulnerabilities:
-            occurences_count = occurences_count + len(c_vulnerability.occurences)
+        # Let the database count occurences instead of loading them
+        occurences_count = (
+            db.session.query(func.count(Occurence.id))
+            .join(Vulnerability)
+            .filter(Vulnerability.analysis_id == project.analysis.id)
+            .scalar()
+        )
     return occurences_count
 
 
@@ -144,6 +163,14 @@ def calculate_risk_level(project):
             project.project_lines_count is not None
             and project.project_lines_count.total_code_count > 0
         ):
+            # Fetch each distinct severity level once, instead of scanning
+            # vulnerabilities for every level
+            vuln_severities = get_present_severities(
+                Vulnerability, project.analysis.id
+            )
+            vuln_dep_severities = get_present_severities(
+                VulnerableDependency, project.analysis.id
+            )
             # 1. Define a base risk level depending on the vulns' severities
             s2rl = {
                 SEVERITY_CRITICAL: 75,
@@ -152,7 +179,7 @@ def calculate_risk_level(project):
                 SEVERITY_LOW: 20,
             }
             for s in s2rl:
-                if has_vuln_with_severity(project.analysis, s):
+                if s in vuln_severities:
                     risk_level = s2rl[s]
                     break
             # 2. Adjust the level with SCA results' severities
@@ -163,45 +190,29 @@ def calculate_risk_level(project):
                 SEVERITY_LOW: 2,
             }
             for s in s2rl:
-                if has_vuln_dep_with_severity(project.analysis, s):
+                if s in vuln_dep_severities:
                     risk_level += s2rl[s]
     return risk_level
 
 
-def has_vuln_with_severity(analysis, severity_level):
-    """Check if an analysis contains at least one vulnerability with
-    the given severity level.
+def get_present_severities(model, analysis_id):
+    """Return the distinct severity levels of the vulnerabilities (or vulnerable
+    dependencies) found by an analysis.
 
     Args:
-        analysis (Analysis): analysis populated with vulnerabilities
-        severity_level (str): severity level to search in analysis' vulnerabilities
+        model (Vulnerability/VulnerableDependency): class of the findings to inspect
+        analysis_id (int): id of the analysis the findings belong to
 
     Returns:
-        bool: True if the analysis contains at least one vulnerability with
-        the given severity level
+        set: severity levels present in the analysis' findings
     """
-    for vuln in analysis.vulnerabilities:
-        if vuln.severity == severity_level:
-            return True
-    return False
-
-
-def has_vuln_dep_with_severity(analysis, severity_level):
-    """Check if an analysis contains at least one vulnerable dependency with
-    the given severity level.
-
-    Args:
-        analysis (Analysis): analysis populated with vulnerable dependencies
-        severity_level (str): severity level to search in analysis' vulnerable dependencies
-
-    Returns:
-        bool: True if the analysis contains at least one vulnerable dependency with
-        the given severity level
-    """
-    for vuln in analysis.vulnerable_dependencies:
-        if vuln.severity == severity_level:
-            return True
-    return False
+    rows = (
+        db.session.query(model.severity)
+        .filter(model.analysis_id == analysis_id)
+        .distinct()
+        .all()
+    )
+    return {row[0] for row in rows}
 
 
 ##
@@ -222,18 +233,21 @@ def top_language_lines_counts(project_lc, top_number):
         list: LanguageLinesCount objects corresponding to the `top_number` most
         present languages
     """
-    return sorted(
-        project_lc.language_lines_counts, key=lambda x: x.code_count, reverse=True
-    )[:top_number]
+    return heapq.nlargest(
+        top_number, project_lc.language_lines_counts, key=attrgetter("code_count")
+    )
 
 
-def top_supported_language_lines_counts(project_lc):
+def top_supported_language_lines_counts(project_lc, supported_languages=None):
     """Return a list of SupportedLanguage objects corresponding to the supported
     languages detected in the project source archive, sorted by their lines counts.
 
     Args:
         project_lc (ProjectLinesCount): project lines count object populated with
         LanguageLinesCount
+        supported_languages (dict): optional supported languages indexed by
+        lowercased name (see get_supported_languages_by_name), to avoid querying
+        them when called for many projects
 
     Returns:
         list: LanguageLinesCount objects corresponding to supported languages
@@ -243,11 +257,12 @@ def top_supported_language_lines_counts(project_lc):
     languages = sorted(
         project_lc.language_lines_counts, key=lambda x: x.code_count, reverse=True
     )
-    supported_languages = SupportedLanguage.query.all()
+    if supported_languages is None:
+        supported_languages = get_supported_languages_by_name()
     for c_lang in languages:
-        for c_sl in supported_languages:
-            if c_sl.name.lower() == c_lang.language.lower():
-                ret.append(c_sl)
+        c_sl = supported_languages.get(c_lang.language.lower())
+        if c_sl is not None:
+            ret.append(c_sl)
     return ret
 
 
@@ -261,18 +276,18 @@ def load_project_lines_count(scc_result):
     Returns:
         ProjectLinesCount: fully populated project lines count object
     """
-    # Empty ProjectLinesCount
+    # ProjectLinesCount with totals calculated over all languages
     project_lc = ProjectLinesCount(
-        total_file_count=0,
-        total_line_count=0,
-        total_blank_count=0,
-        total_comment_count=0,
-        total_code_count=0,
-        total_complexity_count=0,
+        total_file_count=sum(c["Count"] for c in scc_result),
+        total_line_count=sum(c["Lines"] for c in scc_result),
+        total_blank_count=sum(c["Blank"] for c in scc_result),
+        total_comment_count=sum(c["Comment"] for c in scc_result),
+        total_code_count=sum(c["Code"] for c in scc_result),
+        total_complexity_count=sum(c["Complexity"] for c in scc_result),
     )
-    for c in scc_result:
-        # Create a LanguageLineCount
-        language_lines_count = LanguageLinesCount(
+    # Create a LanguageLineCount for each language
+    project_lc.language_lines_counts = [
+        LanguageLinesCount(
             language=c["Name"],
             file_count=c["Count"],
             line_count=c["Lines"],
@@ -281,39 +296,40 @@ def load_project_lines_count(scc_result):
             code_count=c["Code"],
             complexity_count=c["Complexity"],
         )
-        project_lc.language_lines_counts.append(language_lines_count)
-        # Update ProjectLineCount counters
-        project_lc.total_file_count += c["Count"]
-        project_lc.total_line_count += c["Lines"]
-        project_lc.total_blank_count += c["Blank"]
-        project_lc.total_comment_count += c["Comment"]
-        project_lc.total_code_count += c["Code"]
-        project_lc.total_complexity_count += c["Complexity"]
+        for c in scc_result
+    ]
     return project_lc
 
 
 def get_user_projects_ids(current_user):
-    user_teams = Team.query.filter(
-        Team.members.any(username=current_user.username)
-    ).all()
-    projects_id_list = []
-
-    projects_id_list = [project.id for team in user_teams for project in team.projects]
-    projects_id_list = list(set(projects_id_list))
-    return projects_id_list
+    # Projects of all the teams the user is a member of
+    rows = (
+        db.session.query(team_projet_association.c.project_id)
+        .join(
+            team_members_association,
+            team_members_association.c.team_id == team_projet_association.c.team_id,
+        )
+        .filter(team_members_association.c.user_id == current_user.id)
+        .distinct()
+        .all()
+    )
+    return [row[0] for row in rows]
 
 
 def has_access(current_user, project):
     if current_user.role == ROLE_ADMIN:
         return True
-    user_teams = set(
-        Team.query.filter(Team.members.any(username=current_user.username)).all()
-    )
-    project_teams = set(Team.query.filter(Team.projects.any(name=project.name)).all())
-    if user_teams.isdisjoint(project_teams):
-        return False
-    else:
-        return True
+    # Does the user belong to at least one of the project's teams?
+    return db.session.query(
+        exists().where(
+            and_(
+                team_members_association.c.user_id == current_user.id,
+                team_projet_association.c.project_id == project.id,
+                team_members_association.c.team_id
+                == team_projet_association.c.team_id,
+            )
+        )
+    ).scalar()
 
 
 def generate_xls(project, selected_option):
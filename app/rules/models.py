@@ -4,7 +4,7 @@ Copyright (c) 2021 - present Orange Cyberdefense
 """
 
 from app import db
-from sqlalchemy import Column, ForeignKey, Integer, String, Table
+from sqlalchemy import BigInteger, Column, ForeignKey, Integer, String, Table
 from sqlalchemy.sql.sqltypes import DateTime
 
 
@@ -122,3 +122,14 @@ class SupportedLanguage(db.Model):
         secondary=rule_to_supported_language_association_table,
         back_populates="languages",
     )
+
+
+class RuleFileCache(db.Model):
+
+    __tablename__ = "RuleFileCache"
+
+    id = Column("id", Integer, primary_key=True)
+    file_path = Column(String, unique=True)
+    mtime_ns = Column(BigInteger)
+    size = Column(Integer)
+    context = Column(String)